@@ -19,7 +19,14 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import io
+import os
 import re
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+import numpy as np
 from mathutils import Vector, Matrix
 from bpy.props import (
     StringProperty, 
@@ -31,6 +38,12 @@ from bpy.props import (
     PointerProperty
 )
 from bpy.types import PropertyGroup, Operator
+from bpy.app.handlers import persistent
+
+try:
+    from numba import njit
+except ImportError:  # numba is not bundled with Blender, fall back to pure Python
+    njit = None
 
 
 # =============================================================================
@@ -66,6 +79,19 @@ UE5_BONE_ALIASES = {
     'ball_r': ['ball_r', 'toe_r', 'righttoebase', 'r_ball', 'toes_r', 'ball.r'],
 }
 
+# Intern alias strings so lookups with interned bone names hit the identity fast path
+UE5_BONE_ALIASES = {
+    sys.intern(canonical): [sys.intern(alias) for alias in aliases]
+    for canonical, aliases in UE5_BONE_ALIASES.items()
+}
+
+# Reverse lookup: any alias (or canonical name) -> its UE5 canonical bone
+_ALIAS_TO_CANONICAL = {
+    alias: canonical
+    for canonical, aliases in UE5_BONE_ALIASES.items()
+    for alias in (canonical, *aliases)
+}
+
 FINGER_PATTERNS = {
     'thumb': ['thumb', 'finger0', 'finger_0'],
     'index': ['index', 'finger1', 'finger_1', 'pointer'],
@@ -74,11 +100,102 @@ FINGER_PATTERNS = {
     'pinky': ['pinky', 'finger4', 'finger_4', 'little', 'small'],
 }
 
+# Substrings that boost a fuzzy match when both names contain one
+KEY_PARTS = ('spine', 'arm', 'leg', 'hand', 'foot', 'head', 'neck', 'thigh', 'calf', 'shoulder')
+
+# Feature mask layout: one bit per key part, then one bit per finger
+_KEY_PART_BITS = (1 << len(KEY_PARTS)) - 1
+_FINGER_BITS = tuple(1 << (len(KEY_PARTS) + i) for i in range(len(FINGER_PATTERNS)))
+
+# Pattern -> feature bit, for every key part and every finger pattern
+_FEATURE_BITS = {part: 1 << bit for bit, part in enumerate(KEY_PARTS)}
+for _bit, (_finger, _patterns) in zip(_FINGER_BITS, FINGER_PATTERNS.items()):
+    for _pattern in (_finger, *_patterns):
+        _FEATURE_BITS[_pattern] = _FEATURE_BITS.get(_pattern, 0) | _bit
+del _bit, _finger, _patterns, _pattern
+
+# All feature patterns as one alternation, longest first. The lookahead makes
+# it report overlapping hits (e.g. 'calf' and 'foot' in 'calfoot') in a single
+# pass; no two patterns with different bits share a start, so none are lost.
+_FEATURE_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(p) for p in sorted(_FEATURE_BITS, key=len, reverse=True)) + '))'
+)
+
+
+class Confidence(IntEnum):
+    """Mapping confidence category; values are BoneMappingItem.category_code
+    and names match its category items."""
+    HIGH = 0
+    MEDIUM = 1
+    LOW = 2
+    NONE = 3
+
+
+# Lower bounds of LOW, MEDIUM and HIGH confidence
+_CATEGORY_THRESHOLDS = np.array([0.3, 0.5, 0.85])
+
 
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
 
+def levenshtein_hyyro(s1, s2):
+    """Bit-parallel Levenshtein distance (Myers/Hyyro) for len(s1) <= 64.
+    Each column of the DP matrix is packed into the VP/VN bit vectors, so the
+    only Python-level loop is over the characters of s2."""
+    m = len(s1)
+    if m == 0:
+        return len(s2)
+    
+    peq = {}
+    for i, c in enumerate(s1):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    vp = mask
+    vn = 0
+    score = m
+    for c in s2:
+        x = peq.get(c, 0) | vn
+        d0 = (((vp + (x & vp)) ^ vp) | x) & mask
+        hp = (vn | ~(d0 | vp)) & mask
+        hn = d0 & vp
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        x = ((hp << 1) | 1) & mask
+        vp = ((hn << 1) | ~(d0 | x)) & mask
+        vn = d0 & x
+    return score
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _levenshtein_nb(a, b):
+        """Single-row Levenshtein DP over uint8 code arrays, compiled by numba."""
+        n = b.shape[0]
+        row = np.arange(n + 1)
+        for i in range(a.shape[0]):
+            diag = row[0]
+            row[0] = i + 1
+            for j in range(n):
+                cost = diag + (1 if a[i] != b[j] else 0)
+                diag = row[j + 1]
+                row[j + 1] = min(row[j + 1] + 1, row[j] + 1, cost)
+        return row[n]
+else:
+    _levenshtein_nb = None
+
+
+def warm_up_levenshtein():
+    """Trigger numba compilation (or load it from the on-disk cache) up front
+    so the first Build Mapping click doesn't pay for it."""
+    if _levenshtein_nb is not None:
+        levenshtein_distance("spine_01", "spine1")
+
+
 def levenshtein_distance(s1, s2):
     """Calculate the Levenshtein distance between two strings."""
     if len(s1) < len(s2):
@@ -87,6 +204,17 @@ def levenshtein_distance(s1, s2):
     if len(s2) == 0:
         return len(s1)
     
+    # One byte per character only holds for ASCII names
+    if _levenshtein_nb is not None and s1.isascii() and s2.isascii():
+        return int(_levenshtein_nb(
+            np.frombuffer(s1.encode('ascii'), dtype=np.uint8),
+            np.frombuffer(s2.encode('ascii'), dtype=np.uint8),
+        ))
+    
+    # Bone names nearly always fit in a single 64-bit word
+    if len(s2) <= 64:
+        return levenshtein_hyyro(s2, s1)
+    
     previous_row = range(len(s2) + 1)
     for i, c1 in enumerate(s1):
         current_row = [i + 1]
@@ -134,29 +262,57 @@ def get_side_from_name(name):
     return 'center'
 
 
+def compute_feature_mask(norm):
+    """Bitmask of the key parts and fingers present in a normalized bone name."""
+    mask = 0
+    for match in _FEATURE_RE.finditer(norm):
+        mask |= _FEATURE_BITS[match.group(1)]
+    return mask
+
+
+def name_trigrams(name):
+    """Return the set of character trigrams in a name, plus the name itself
+    so names shorter than three characters still index to something."""
+    return {name[i:i + 3] for i in range(len(name) - 2)} | {name}
+
+
+def bone_name_info(name):
+    """
+    Precompute everything the matching passes read from a bone name.
+    Returns tuple: (name, lower, normalized, side, feature_mask)
+    """
+    lower = sys.intern(name.lower())
+    norm = sys.intern(normalize_bone_name(lower))
+    return (name, lower, norm, get_side_from_name(lower), compute_feature_mask(norm))
+
+
 def compute_match_confidence(ue5_bone, target_bone):
     """
     Compute confidence score (0.0 to 1.0) for a bone name match.
     Returns tuple: (confidence, match_reason)
     """
-    ue5_norm = normalize_bone_name(ue5_bone)
-    target_norm = normalize_bone_name(target_bone)
+    return score_bone_info(bone_name_info(ue5_bone), bone_name_info(target_bone))
+
+
+def score_bone_info(ue5_info, target_info):
+    """
+    Confidence scoring for two bone_name_info() tuples, so callers scoring
+    many pairs only derive the per-name data once per bone.
+    Returns tuple: (confidence, match_reason)
+    """
+    _, ue5_lower, ue5_norm, ue5_side, ue5_mask = ue5_info
+    _, _, target_norm, target_side, target_mask = target_info
     
     # Exact match after normalization
     if ue5_norm == target_norm:
         return (1.0, "exact_match")
     
     # Check alias table
-    ue5_lower = ue5_bone.lower()
-    for ue5_canonical, aliases in UE5_BONE_ALIASES.items():
-        if ue5_lower == ue5_canonical or ue5_lower in aliases:
-            if target_norm in aliases or target_norm == ue5_canonical:
-                return (0.95, "alias_match")
+    ue5_canonical = _ALIAS_TO_CANONICAL.get(ue5_lower)
+    if ue5_canonical is not None and _ALIAS_TO_CANONICAL.get(target_norm) == ue5_canonical:
+        return (0.95, "alias_match")
     
     # Check side consistency
-    ue5_side = get_side_from_name(ue5_bone)
-    target_side = get_side_from_name(target_bone)
-    
     if ue5_side != target_side and ue5_side != 'center' and target_side != 'center':
         return (0.0, "side_mismatch")
     
@@ -169,16 +325,13 @@ def compute_match_confidence(ue5_bone, target_bone):
     similarity = 1.0 - (distance / max_len)
     
     # Boost score if key substrings match
-    key_parts = ['spine', 'arm', 'leg', 'hand', 'foot', 'head', 'neck', 'thigh', 'calf', 'shoulder']
-    for part in key_parts:
-        if part in ue5_norm and part in target_norm:
-            similarity = min(1.0, similarity + 0.15)
-            break
+    if ue5_mask & target_mask & _KEY_PART_BITS:
+        similarity = min(1.0, similarity + 0.15)
     
     # Finger matching
-    for finger, patterns in FINGER_PATTERNS.items():
-        ue5_has_finger = any(p in ue5_norm for p in patterns) or finger in ue5_norm
-        target_has_finger = any(p in target_norm for p in patterns) or finger in target_norm
+    for finger_bit in _FINGER_BITS:
+        ue5_has_finger = bool(ue5_mask & finger_bit)
+        target_has_finger = bool(target_mask & finger_bit)
         if ue5_has_finger and target_has_finger:
             similarity = min(1.0, similarity + 0.2)
             break
@@ -193,161 +346,420 @@ def compute_match_confidence(ue5_bone, target_bone):
         return (similarity, "fuzzy_low")
 
 
+def _build_group_soa(mesh_obj):
+    """
+    Read every vertex group of a mesh in a single pass over its vertices.
+    Returns dict: group_index -> (vertex_indices int32 array, weights float32 array)
+    """
+    buckets = defaultdict(lambda: ([], []))
+    for vert in mesh_obj.data.vertices:
+        for g in vert.groups:
+            idxs, ws = buckets[g.group]
+            idxs.append(vert.index)
+            ws.append(g.weight)
+    return {
+        group: (np.asarray(idxs, dtype=np.int32), np.asarray(ws, dtype=np.float32))
+        for group, (idxs, ws) in buckets.items()
+    }
+
+
+def _merge_weights_py(src_idx, src_w, tgt_idx, tgt_w, n_vertices):
+    """
+    Merge a source vertex group into a target group given as sparse arrays:
+    weights are averaged where both groups have a vertex, otherwise the one
+    group that has it wins. Returns the merged group as (indices, weights).
+    """
+    src = np.zeros(n_vertices, dtype=np.float32)
+    tgt = np.zeros(n_vertices, dtype=np.float32)
+    in_src = np.zeros(n_vertices, dtype=np.bool_)
+    in_tgt = np.zeros(n_vertices, dtype=np.bool_)
+    src[src_idx] = src_w
+    tgt[tgt_idx] = tgt_w
+    in_src[src_idx] = True
+    in_tgt[tgt_idx] = True
+    
+    merged = np.where(in_src, np.where(in_tgt, (src + tgt) / 2, src), tgt)
+    out_idx = np.flatnonzero(in_src | in_tgt).astype(np.int32)
+    return out_idx, merged[out_idx]
+
+
+# Only typed arrays and ints go in, so numba compiles this in nopython mode
+_merge_weights = njit(cache=True)(_merge_weights_py) if njit is not None else _merge_weights_py
+
+
+def matrix_euler_z(matrices):
+    """
+    Z rotation of Matrix.to_euler() for a batch of 4x4 matrices laid out as
+    foreach_get("matrix_local") returns them (column-major, so m[col][row]).
+    Follows Blender's mat3_normalized_to_eul, including its choice between the
+    two equivalent solutions.
+    """
+    m = matrices[:, :3, :3].astype(np.float64)
+    m = m / np.linalg.norm(m, axis=2, keepdims=True)
+    
+    cy = np.hypot(m[:, 0, 0], m[:, 0, 1])
+    y1 = np.arctan2(-m[:, 0, 2], cy)
+    y2 = np.arctan2(-m[:, 0, 2], -cy)
+    x1 = np.arctan2(m[:, 1, 2], m[:, 2, 2])
+    x2 = np.arctan2(-m[:, 1, 2], -m[:, 2, 2])
+    z1 = np.arctan2(m[:, 0, 1], m[:, 0, 0])
+    z2 = np.arctan2(-m[:, 0, 1], -m[:, 0, 0])
+    
+    use_second = np.abs(x1) + np.abs(y1) + np.abs(z1) > np.abs(x2) + np.abs(y2) + np.abs(z2)
+    z = np.where(use_second, z2, z1)
+    # Gimbal lock: Blender puts the whole rotation in X
+    return np.where(cy > 16.0 * np.finfo(np.float32).eps, z, 0.0)
+
+
+def _compute_merge_writes(group_soa, merges, n_vertices):
+    """
+    Compute the vertex group writes for a mesh's planned merges.
+    merges holds (source_index, target_index) pairs by group index at
+    snapshot time, applied in order; group_soa is a _build_group_soa()
+    snapshot and is updated with each merged target so later merges into the
+    same group see it. Returns one list of (weight, vertex_indices) per merge,
+    one entry per distinct weight since VertexGroup.add() takes a single
+    weight. Touches no bpy data, so it is safe to run off the main thread.
+    """
+    empty = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+    writes = []
+    for source, target in merges:
+        src_idx, src_w = group_soa.get(source, empty)
+        if not len(src_idx):
+            # Nothing assigned to the source group, the target stays as is
+            writes.append([])
+            continue
+        tgt_idx, tgt_w = group_soa.get(target, empty)
+        
+        out_idx, out_w = _merge_weights(src_idx, src_w, tgt_idx, tgt_w, n_vertices)
+        
+        # Only vertices in the source group change
+        written = out_w[np.searchsorted(out_idx, src_idx)]
+        weights, inverse = np.unique(written, return_inverse=True)
+        by_weight = np.split(src_idx[np.argsort(inverse, kind='stable')],
+                             np.cumsum(np.bincount(inverse))[:-1])
+        writes.append([(weight, indices.tolist())
+                       for weight, indices in zip(weights.tolist(), by_weight)])
+        
+        group_soa[target] = (out_idx, out_w.astype(np.float32))
+    return writes
+
+
+def max_weight_assignment(scores):
+    """
+    Solve the rectangular assignment problem maximizing the total score.
+    Hungarian algorithm with potentials, O(n^2 * m) with numpy inner steps.
+    Returns (rows, cols) index arrays of the assigned pairs.
+    """
+    transposed = scores.shape[0] > scores.shape[1]
+    cost = -(scores.T if transposed else scores)
+    n, m = cost.shape
+    if n == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=int)  # p[j] = 1-based row assigned to column j
+    way = np.zeros(m + 1, dtype=int)
+    
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used
+            free[0] = False
+            reduced = np.full(m + 1, np.inf)
+            reduced[1:] = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv)
+            minv[better] = reduced[better]
+            way[better] = j0
+            j1 = int(np.argmin(np.where(free, minv, np.inf)))
+            delta = minv[j1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    
+    cols = np.flatnonzero(p[1:])
+    rows = p[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
 def build_bone_mapping(ue5_armature, target_armature):
     """
     Build automatic bone mapping between UE5 skeleton and target skeleton.
     Uses multi-pass approach: exact matches first, then fuzzy matching.
-    Returns list of dicts with mapping info and confidence scores.
+    Returns list of dicts with mapping info, confidence scores and a
+    Confidence category.
     """
-    ue5_bones = [bone.name for bone in ue5_armature.data.bones]
-    target_bones = [bone.name for bone in target_armature.data.bones]
+    # Per-bone (name, lower, normalized, side, feature_mask) tuples, derived
+    # once so no pass ever lowercases or normalizes a name again
+    ue5_info = [bone_name_info(bone.name) for bone in ue5_armature.data.bones]
+    target_info = [bone_name_info(bone.name) for bone in target_armature.data.bones]
     
-    # Create lookup sets for fast matching
-    target_bones_lower = {bone.lower(): bone for bone in target_bones}
-    target_bones_normalized = {normalize_bone_name(bone): bone for bone in target_bones}
+    # Build every target lookup in a single pass over the target bones
+    target_bones_lower = {}
+    target_bones_normalized = {}
+    targets_by_canonical = defaultdict(list)
+    for info in target_info:
+        target_bones_lower[info[1]] = info[0]
+        target_bones_normalized[info[2]] = info[0]
+        canonical = _ALIAS_TO_CANONICAL.get(info[1])
+        if canonical is not None:
+            targets_by_canonical[canonical].append(info[0])
     
     used_targets = set()
-    mapping_results = {}  # ue5_bone -> mapping dict
+    
+    # Mapping results are kept as parallel columns indexed by UE5 bone position
+    bone_count = len(ue5_info)
+    target_col = [""] * bone_count
+    conf_col = np.zeros(bone_count, dtype=np.float64)
+    reason_col = ["no_match"] * bone_count
+    mapped_col = np.zeros(bone_count, dtype=bool)
     
     # =========================================================================
     # PASS 1: Exact case-insensitive matches (highest priority)
     # =========================================================================
-    for ue5_bone in ue5_bones:
-        ue5_lower = ue5_bone.lower()
-        
-        if ue5_lower in target_bones_lower:
-            target_bone = target_bones_lower[ue5_lower]
-            if target_bone not in used_targets:
-                mapping_results[ue5_bone] = {
-                    'ue5_bone': ue5_bone,
-                    'target_bone': target_bone,
-                    'confidence': 1.0,
-                    'category': 'HIGH',
-                    'reason': 'exact_match',
-                    'enabled': True,
-                }
-                used_targets.add(target_bone)
+    for i, info in enumerate(ue5_info):
+        target_bone = target_bones_lower.get(info[1])
+        if target_bone is not None and target_bone not in used_targets:
+            target_col[i] = target_bone
+            conf_col[i] = 1.0
+            reason_col[i] = 'exact_match'
+            mapped_col[i] = True
+            used_targets.add(target_bone)
     
     # =========================================================================
     # PASS 2: Normalized exact matches (e.g., def_spine_01 -> spine_01)
     # =========================================================================
-    for ue5_bone in ue5_bones:
-        if ue5_bone in mapping_results:
+    for i, info in enumerate(ue5_info):
+        if mapped_col[i]:
             continue
         
-        ue5_norm = normalize_bone_name(ue5_bone)
-        
-        if ue5_norm in target_bones_normalized:
-            target_bone = target_bones_normalized[ue5_norm]
-            if target_bone not in used_targets:
-                mapping_results[ue5_bone] = {
-                    'ue5_bone': ue5_bone,
-                    'target_bone': target_bone,
-                    'confidence': 0.95,
-                    'category': 'HIGH',
-                    'reason': 'normalized_match',
-                    'enabled': True,
-                }
-                used_targets.add(target_bone)
+        target_bone = target_bones_normalized.get(info[2])
+        if target_bone is not None and target_bone not in used_targets:
+            target_col[i] = target_bone
+            conf_col[i] = 0.95
+            reason_col[i] = 'normalized_match'
+            mapped_col[i] = True
+            used_targets.add(target_bone)
     
     # =========================================================================
     # PASS 3: Alias table matches
     # =========================================================================
-    for ue5_bone in ue5_bones:
-        if ue5_bone in mapping_results:
+    for i, info in enumerate(ue5_info):
+        if mapped_col[i]:
             continue
         
-        ue5_lower = ue5_bone.lower()
-        matched = False
-        
-        for ue5_canonical, aliases in UE5_BONE_ALIASES.items():
-            if ue5_lower == ue5_canonical or ue5_lower in aliases:
-                # Found UE5 bone in alias table, look for target match
-                for target_bone in target_bones:
-                    if target_bone in used_targets:
-                        continue
-                    target_lower = target_bone.lower()
-                    if target_lower == ue5_canonical or target_lower in aliases:
-                        mapping_results[ue5_bone] = {
-                            'ue5_bone': ue5_bone,
-                            'target_bone': target_bone,
-                            'confidence': 0.90,
-                            'category': 'HIGH',
-                            'reason': 'alias_match',
-                            'enabled': True,
-                        }
-                        used_targets.add(target_bone)
-                        matched = True
-                        break
-                if matched:
-                    break
+        canonical = _ALIAS_TO_CANONICAL.get(info[1])
+        if canonical is None:
+            continue
+        
+        for target_bone in targets_by_canonical.get(canonical, ()):
+            if target_bone in used_targets:
+                continue
+            target_col[i] = target_bone
+            conf_col[i] = 0.90
+            reason_col[i] = 'alias_match'
+            mapped_col[i] = True
+            used_targets.add(target_bone)
+            break
     
     # =========================================================================
     # PASS 4: Fuzzy matching for remaining bones
     # =========================================================================
-    remaining_ue5 = [b for b in ue5_bones if b not in mapping_results]
-    remaining_targets = [b for b in target_bones if b not in used_targets]
+    remaining_ue5 = np.flatnonzero(~mapped_col)
+    remaining_targets = [info for info in target_info if info[0] not in used_targets]
+    
+    # Index remaining targets by trigram of their normalized name so each UE5 bone
+    # is only scored against targets sharing at least one trigram with it. Alias
+    # pairs (thigh_l/leftupleg) rarely share one, so targets are also indexed by
+    # the canonical name score_bone_info() matches their normalized name to.
+    target_trigram_index = defaultdict(set)
+    target_canonical_index = defaultdict(set)
+    for col, info in enumerate(remaining_targets):
+        for trigram in name_trigrams(info[2]):
+            target_trigram_index[trigram].add(col)
+        canonical = _ALIAS_TO_CANONICAL.get(info[2])
+        if canonical is not None:
+            target_canonical_index[canonical].add(col)
     
-    for ue5_bone in remaining_ue5:
-        best_match = None
+    # Score every remaining pair that shares a trigram. Pairs that aren't scored
+    # or fall below 0.3 stay at zero so they are never a useful assignment.
+    scores = np.zeros((len(remaining_ue5), len(remaining_targets)))
+    pair_reasons = {}
+    for row, i in enumerate(remaining_ue5):
+        info = ue5_info[i]
         best_confidence = 0.0
         best_reason = "no_match"
         
-        for target_bone in remaining_targets:
-            if target_bone in used_targets:
-                continue
-            
-            confidence, reason = compute_match_confidence(ue5_bone, target_bone)
+        candidates = set().union(*(
+            target_trigram_index.get(trigram, ())
+            for trigram in name_trigrams(info[2])
+        ))
+        
+        alias_candidates = target_canonical_index.get(_ALIAS_TO_CANONICAL.get(info[1]), set())
+        
+        # Fall back to a full scan if nothing shares a trigram
+        for col in (sorted(candidates | alias_candidates) if candidates
+                    else range(len(remaining_targets))):
+            confidence, reason = score_bone_info(info, remaining_targets[col])
             
             if confidence > best_confidence:
                 best_confidence = confidence
-                best_match = target_bone
                 best_reason = reason
-        
-        # Determine confidence category
-        if best_confidence >= 0.85:
-            category = 'HIGH'
-        elif best_confidence >= 0.5:
-            category = 'MEDIUM'
-        elif best_match is not None and best_confidence >= 0.3:
-            category = 'LOW'
-        else:
-            category = 'NONE'
-        
-        mapping_results[ue5_bone] = {
-            'ue5_bone': ue5_bone,
-            'target_bone': best_match if best_confidence >= 0.3 else "",
-            'confidence': best_confidence,
-            'category': category,
-            'reason': best_reason,
-            'enabled': best_confidence >= 0.5,
-        }
-        
-        if best_match and best_confidence >= 0.3:
-            used_targets.add(best_match)
+            if confidence >= 0.3:
+                scores[row, col] = confidence
+                pair_reasons[row, col] = reason
+        
+        # Bones that end up unassigned still report their best sub-threshold score
+        if best_confidence < 0.3:
+            conf_col[i] = best_confidence
+            reason_col[i] = best_reason
+    
+    # Exact/alias hits the scorer still finds after normalization are locked in
+    # bone order, the same way Passes 1-3 do, before the fuzzy assignment
+    for row, i in enumerate(remaining_ue5):
+        hits = [col for col in np.flatnonzero(scores[row])
+                if pair_reasons[row, col] in ('exact_match', 'alias_match')]
+        if not hits:
+            continue
+        col = max(hits, key=lambda c: scores[row, c])
+        target_col[i] = remaining_targets[col][0]
+        conf_col[i] = scores[row, col]
+        reason_col[i] = pair_reasons[row, col]
+        scores[row, :] = 0.0
+        scores[:, col] = 0.0
+    
+    # Globally optimal 1-to-1 assignment instead of first-come greedy picks
+    for row, col in zip(*max_weight_assignment(scores)):
+        if scores[row, col] < 0.3:
+            continue
+        i = remaining_ue5[row]
+        target_col[i] = remaining_targets[col][0]
+        conf_col[i] = scores[row, col]
+        reason_col[i] = pair_reasons[row, col]
+    
+    # Categorize and enable every mapping at once from the confidence column
+    category_col = (
+        Confidence.NONE - np.searchsorted(_CATEGORY_THRESHOLDS, conf_col, side='right')
+    ).astype(np.uint8)
+    enabled_col = category_col <= Confidence.MEDIUM
     
-    # Return mappings in original bone order
-    return [mapping_results[bone] for bone in ue5_bones]
+    # Dicts are only materialized here, in original bone order
+    return [
+        {
+            'ue5_bone': ue5_info[i][0],
+            'target_bone': target_col[i],
+            'confidence': float(conf_col[i]),
+            'category': Confidence(category_col[i]),
+            'reason': reason_col[i],
+            'enabled': bool(enabled_col[i]),
+        }
+        for i in range(bone_count)
+    ]
+
+
+def update_mapping_counts(settings, counts=None):
+    """
+    Store per-category mapping totals on the settings for the panel's
+    statistics row. counts maps Confidence to a total; when omitted the
+    category codes are read back with one foreach_get and counted.
+    """
+    if counts is None:
+        codes = np.empty(len(settings.bone_mappings), dtype=np.int32)
+        settings.bone_mappings.foreach_get("category_code", codes)
+        counts = np.bincount(codes, minlength=len(Confidence)).tolist()
+    settings.count_high = counts[Confidence.HIGH]
+    settings.count_medium = counts[Confidence.MEDIUM]
+    settings.count_low = counts[Confidence.LOW]
+    settings.count_unmapped = counts[Confidence.NONE]
+
+
+@persistent
+def migrate_mapping_categories(_dummy):
+    """
+    load_post handler: copy categories saved under the old enum key into
+    category_code and recount, so foreach_get and the cached totals see them.
+    """
+    for scene in bpy.data.scenes:
+        if scene.library is not None:
+            continue
+        settings = scene.ab_skeleton_retarget
+        migrated = False
+        for item in settings.bone_mappings:
+            if item.get("category_code") is None and item.get("category") is not None:
+                item.category_code = item["category"]
+                migrated = True
+        if migrated:
+            update_mapping_counts(settings)
+
+
+def migrate_open_file_mapping_categories():
+    """One-shot timer run after register(), when bpy.data is available, for
+    a file that was already open when the addon was enabled."""
+    migrate_mapping_categories(None)
+    return None
 
 
 # =============================================================================
 # PROPERTY GROUPS
 # =============================================================================
 
+def get_mapping_category_code(item):
+    """
+    Confidence code of a BoneMappingItem. Mappings saved before category_code
+    existed only have the enum's own stored value, whose implicit item
+    numbers (0-3) are already Confidence codes.
+    """
+    return item.get("category_code", item.get("category", Confidence.NONE))
+
+
+def _get_mapping_category(self):
+    return get_mapping_category_code(self)
+
+
+def _set_mapping_category(self, value):
+    self.category_code = value
+
+
 class BoneMappingItem(PropertyGroup):
     """Single bone mapping entry for UI display."""
     ue5_bone: StringProperty(name="UE5 Bone", default="")
     target_bone: StringProperty(name="Target Bone", default="")
     confidence: FloatProperty(name="Confidence", default=0.0, min=0.0, max=1.0)
+    # Stored as a Confidence value so lists can be filtered, sorted and counted
+    # on ints; category is an enum view of the same value
+    category_code: IntProperty(
+        name="Category Code",
+        default=Confidence.NONE,
+        min=Confidence.HIGH,
+        max=Confidence.NONE
+    )
     category: EnumProperty(
         name="Category",
         items=[
-            ('HIGH', "High", "High confidence match"),
-            ('MEDIUM', "Medium", "Medium confidence - review recommended"),
-            ('LOW', "Low", "Low confidence - likely wrong"),
-            ('NONE', "None", "No match found"),
+            ('HIGH', "High", "High confidence match", Confidence.HIGH),
+            ('MEDIUM', "Medium", "Medium confidence - review recommended", Confidence.MEDIUM),
+            ('LOW', "Low", "Low confidence - likely wrong", Confidence.LOW),
+            ('NONE', "None", "No match found", Confidence.NONE),
         ],
-        default='NONE'
+        get=_get_mapping_category,
+        set=_set_mapping_category
     )
     enabled: BoolProperty(name="Enabled", default=True)
     reason: StringProperty(name="Reason", default="")
@@ -373,6 +785,16 @@ class SkeletonRetargetSettings(PropertyGroup):
     show_medium_confidence: BoolProperty(name="Show Medium", default=True)
     show_low_confidence: BoolProperty(name="Show Low", default=True)
     show_unmapped: BoolProperty(name="Show Unmapped", default=True)
+    # Category totals for the panel, kept in sync by update_mapping_counts()
+    count_high: IntProperty(name="High Count", default=0)
+    count_medium: IntProperty(name="Medium Count", default=0)
+    count_low: IntProperty(name="Low Count", default=0)
+    count_unmapped: IntProperty(name="Unmapped Count", default=0)
+    verbose_logging: BoolProperty(
+        name="Log Bone Lists",
+        description="Write both skeletons' bone lists to the console and a Text block when building the mapping",
+        default=True
+    )
 
 
 # =============================================================================
@@ -402,7 +824,8 @@ class ASSETSBRIDGE_OT_BuildBoneMapping(Operator):
         settings.target_armature = target_armature
         
         # Log all bones for reference
-        self.log_bone_lists(source_armature, target_armature)
+        if settings.verbose_logging:
+            self.log_bone_lists(source_armature, target_armature)
         
         # Clear existing mappings
         settings.bone_mappings.clear()
@@ -410,29 +833,23 @@ class ASSETSBRIDGE_OT_BuildBoneMapping(Operator):
         # Build mappings
         mappings = build_bone_mapping(source_armature, target_armature)
         
-        high_count = 0
-        medium_count = 0
-        low_count = 0
-        unmapped_count = 0
-        
+        items = settings.bone_mappings
         for mapping in mappings:
-            item = settings.bone_mappings.add()
+            item = items.add()
             item.ue5_bone = mapping['ue5_bone']
             item.target_bone = mapping['target_bone']
-            item.confidence = mapping['confidence']
-            item.category = mapping['category']
-            item.enabled = mapping['enabled']
             item.reason = mapping['reason']
-            
-            if mapping['category'] == 'HIGH':
-                high_count += 1
-            elif mapping['category'] == 'MEDIUM':
-                medium_count += 1
-            elif mapping['category'] == 'LOW':
-                low_count += 1
-            else:
-                unmapped_count += 1
         
+        # Numeric fields go in with one RNA call each
+        items.foreach_set("category_code", [mapping['category'] for mapping in mappings])
+        items.foreach_set("confidence", [mapping['confidence'] for mapping in mappings])
+        items.foreach_set("enabled", [mapping['enabled'] for mapping in mappings])
+        
+        update_mapping_counts(settings, Counter(mapping['category'] for mapping in mappings))
+        high_count = settings.count_high
+        medium_count = settings.count_medium
+        low_count = settings.count_low
+        unmapped_count = settings.count_unmapped
         self.report({'INFO'}, f"Mapping complete: {high_count} high, {medium_count} medium, {low_count} low, {unmapped_count} unmapped")
         return {'FINISHED'}
     
@@ -442,29 +859,18 @@ class ASSETSBRIDGE_OT_BuildBoneMapping(Operator):
         source_bones = [bone.name for bone in source_armature.data.bones]
         target_bones = [bone.name for bone in target_armature.data.bones]
         
-        # Build the log content
-        lines = []
-        lines.append("=" * 80)
-        lines.append("SKELETON RETARGET - BONE REFERENCE LIST")
-        lines.append("=" * 80)
-        
-        lines.append(f"\nUE5 SOURCE SKELETON: {source_armature.name}")
-        lines.append(f"Total bones: {len(source_bones)}")
-        lines.append("-" * 40)
-        for i, bone in enumerate(source_bones, 1):
-            lines.append(f"  {i:3d}. {bone}")
-        
-        lines.append(f"\nTARGET SKELETON: {target_armature.name}")
-        lines.append(f"Total bones: {len(target_bones)}")
-        lines.append("-" * 40)
-        for i, bone in enumerate(target_bones, 1):
-            lines.append(f"  {i:3d}. {bone}")
+        # Build the log content in one buffer
+        out = io.StringIO()
+        rule = "=" * 80
+        out.write(f"{rule}\nSKELETON RETARGET - BONE REFERENCE LIST\n{rule}\n")
         
-        lines.append("\n" + "=" * 80)
-        lines.append("END OF BONE REFERENCE LIST")
-        lines.append("=" * 80)
+        for title, armature, bones in (("UE5 SOURCE SKELETON", source_armature, source_bones),
+                                       ("TARGET SKELETON", target_armature, target_bones)):
+            out.write(f"\n{title}: {armature.name}\nTotal bones: {len(bones)}\n{'-' * 40}\n")
+            out.writelines(f"  {i:3d}. {bone}\n" for i, bone in enumerate(bones, 1))
         
-        log_text = "\n".join(lines)
+        out.write(f"\n{rule}\nEND OF BONE REFERENCE LIST\n{rule}")
+        log_text = out.getvalue()
         
         # Print to system console
         print(log_text)
@@ -473,11 +879,10 @@ class ASSETSBRIDGE_OT_BuildBoneMapping(Operator):
         text_name = "AB_BoneMapping_Log"
         if text_name in bpy.data.texts:
             text_block = bpy.data.texts[text_name]
-            text_block.clear()
         else:
             text_block = bpy.data.texts.new(text_name)
         
-        text_block.write(log_text)
+        text_block.from_string(log_text)
         
         self.report({'INFO'}, f"Bone list saved to Text block '{text_name}' (see Text Editor)")
 
@@ -491,6 +896,7 @@ class ASSETSBRIDGE_OT_ClearBoneMapping(Operator):
     def execute(self, context):
         settings = context.scene.ab_skeleton_retarget
         settings.bone_mappings.clear()
+        update_mapping_counts(settings)
         settings.source_armature = None
         settings.target_armature = None
         self.report({'INFO'}, "Bone mapping cleared")
@@ -526,6 +932,12 @@ class ASSETSBRIDGE_OT_RetargetSkeleton(Operator):
         description="Delete meshes originally parented to the UE5 skeleton (e.g., Mannequin)",
         default=True
     )
+    
+    # Meshes parented to or using each armature, from one scene walk, and
+    # the per-armature results of find_meshes_for_armature. Both are filled
+    # lazily during execute and reset when it ends, so they never outlive a run.
+    _armature_users = None
+    _mesh_index_cache = {}
 
     @classmethod
     def poll(cls, context):
@@ -539,93 +951,108 @@ class ASSETSBRIDGE_OT_RetargetSkeleton(Operator):
         source = settings.source_armature
         target = settings.target_armature
         
-        # Validate armatures still exist
-        if source is None or target is None:
-            self.report({'ERROR'}, "Source or target armature no longer exists")
-            return {'CANCELLED'}
-        
-        # Build mapping dict from enabled mappings only
-        bone_map = {}
-        skipped_bones = []
-        
-        for mapping in settings.bone_mappings:
-            if mapping.enabled and mapping.target_bone:
-                bone_map[mapping.ue5_bone] = mapping.target_bone
-            else:
-                skipped_bones.append(mapping.ue5_bone)
-        
-        if not bone_map:
-            self.report({'ERROR'}, "No enabled bone mappings found")
-            return {'CANCELLED'}
-        
-        # Log skipped bones
-        if skipped_bones:
-            self.report({'WARNING'}, f"Skipping {len(skipped_bones)} unmapped/disabled bones")
-        
-        # Collect UE5 source meshes BEFORE transfer (meshes parented to UE5 skeleton)
-        ue5_source_meshes = []
-        if self.delete_ue5_source_mesh:
-            ue5_source_meshes = self.find_meshes_for_armature(source)
-        
-        # Step 1: Align UE5 skeleton bones to target positions
-        aligned_count = self.align_skeleton_bones(context, source, target, bone_map)
-        
-        if aligned_count == 0:
-            self.report({'ERROR'}, "No bones were aligned - check your mapping")
-            return {'CANCELLED'}
-        
-        # Step 2: Transfer weights and collect transferred meshes
-        transferred_meshes = []
-        if self.transfer_weights:
-            transferred_meshes = self.transfer_mesh_weights(context, source, target, bone_map)
-        
-        # Step 3: Setup proper hierarchy - move UE5 skeleton to target's position, parent meshes
-        self.setup_hierarchy(context, source, target, transferred_meshes)
-        
-        # Step 4: Delete UE5 source meshes (if they exist and weren't transferred)
-        deleted_ue5_meshes = 0
-        if self.delete_ue5_source_mesh and ue5_source_meshes:
-            deleted_ue5_meshes = self.cleanup_ue5_meshes(context, ue5_source_meshes, transferred_meshes)
-        
-        # Step 5: Delete target skeleton
-        deleted_target = False
-        if self.delete_target_skeleton and target:
-            deleted_target = self.cleanup_target_skeleton(context, target)
-        
-        # Clear the mapping references since target is deleted
-        if deleted_target:
-            settings.target_armature = None
-            settings.bone_mappings.clear()
-        
-        # Build result message
-        msg_parts = [f"{aligned_count} bones aligned", f"{len(transferred_meshes)} meshes rebound"]
-        if deleted_ue5_meshes > 0:
-            msg_parts.append(f"{deleted_ue5_meshes} UE5 meshes deleted")
-        if deleted_target:
-            msg_parts.append("target skeleton deleted")
-        
-        self.report({'INFO'}, f"Retarget complete: {', '.join(msg_parts)}")
-        return {'FINISHED'}
+        try:
+            # Validate armatures still exist
+            if source is None or target is None:
+                self.report({'ERROR'}, "Source or target armature no longer exists")
+                return {'CANCELLED'}
+            
+            # Build mapping dict from enabled mappings only
+            bone_map = {}
+            skipped_bones = []
+            
+            for mapping in settings.bone_mappings:
+                if mapping.enabled and mapping.target_bone:
+                    bone_map[mapping.ue5_bone] = mapping.target_bone
+                else:
+                    skipped_bones.append(mapping.ue5_bone)
+            
+            if not bone_map:
+                self.report({'ERROR'}, "No enabled bone mappings found")
+                return {'CANCELLED'}
+            
+            # Log skipped bones
+            if skipped_bones:
+                self.report({'WARNING'}, f"Skipping {len(skipped_bones)} unmapped/disabled bones")
+            
+            # Collect UE5 source meshes BEFORE transfer (meshes parented to UE5 skeleton)
+            ue5_source_meshes = []
+            if self.delete_ue5_source_mesh:
+                ue5_source_meshes = self.find_meshes_for_armature(source)
+            
+            # Step 1: Align UE5 skeleton bones to target positions
+            aligned_count = self.align_skeleton_bones(context, source, target, bone_map)
+            
+            if aligned_count == 0:
+                self.report({'ERROR'}, "No bones were aligned - check your mapping")
+                return {'CANCELLED'}
+            
+            # Step 2: Transfer weights and collect transferred meshes
+            transferred_meshes = []
+            if self.transfer_weights:
+                transferred_meshes = self.transfer_mesh_weights(context, source, target, bone_map)
+            
+            # Step 3: Setup proper hierarchy - move UE5 skeleton to target's position, parent meshes
+            self.setup_hierarchy(context, source, target, transferred_meshes)
+            
+            # Step 4: Delete UE5 source meshes (if they exist and weren't transferred)
+            deleted_ue5_meshes = 0
+            if self.delete_ue5_source_mesh and ue5_source_meshes:
+                deleted_ue5_meshes = self.cleanup_ue5_meshes(context, ue5_source_meshes, transferred_meshes)
+            
+            # Step 5: Delete target skeleton
+            deleted_target = False
+            if self.delete_target_skeleton and target:
+                deleted_target = self.cleanup_target_skeleton(context, target)
+            
+            # Clear the mapping references since target is deleted
+            if deleted_target:
+                settings.target_armature = None
+                settings.bone_mappings.clear()
+                update_mapping_counts(settings)
+            
+            # Build result message
+            msg_parts = [f"{aligned_count} bones aligned", f"{len(transferred_meshes)} meshes rebound"]
+            if deleted_ue5_meshes > 0:
+                msg_parts.append(f"{deleted_ue5_meshes} UE5 meshes deleted")
+            if deleted_target:
+                msg_parts.append("target skeleton deleted")
+            
+            self.report({'INFO'}, f"Retarget complete: {', '.join(msg_parts)}")
+            return {'FINISHED'}
+        finally:
+            # Don't hold on to objects this run may have deleted
+            type(self)._armature_users = None
+            type(self)._mesh_index_cache = {}
     
     def find_meshes_for_armature(self, armature):
         """Find all meshes parented to or using this armature."""
-        meshes = []
-        for obj in bpy.data.objects:
-            if obj.type != 'MESH':
-                continue
-            
-            # Check armature modifier
-            for mod in obj.modifiers:
-                if mod.type == 'ARMATURE' and mod.object == armature:
-                    if obj not in meshes:
-                        meshes.append(obj)
-                    break
-            
-            # Check parent
-            if obj.parent == armature and obj not in meshes:
-                meshes.append(obj)
+        cache = type(self)._mesh_index_cache
+        if armature in cache:
+            return list(cache[armature])
         
-        return meshes
+        meshes = self.get_armature_users().get(armature, [])
+        cache[armature] = meshes
+        return list(meshes)
+    
+    def get_armature_users(self):
+        """Map each armature to the meshes parented to it or whose armature
+        modifiers use it, in scene order. Object.children would walk the
+        whole scene again for every armature, so parents are read here too."""
+        cls = type(self)
+        if cls._armature_users is None:
+            users = defaultdict(list)
+            for obj in bpy.data.objects:
+                if obj.type != 'MESH':
+                    continue
+                armatures = {mod.object for mod in obj.modifiers
+                             if mod.type == 'ARMATURE' and mod.object is not None}
+                if obj.parent is not None:
+                    armatures.add(obj.parent)
+                for armature in armatures:
+                    users[armature].append(obj)
+            cls._armature_users = users
+        return cls._armature_users
     
     def setup_hierarchy(self, context, source_armature, target_armature, meshes):
         """Setup proper parent-child hierarchy for export.
@@ -655,22 +1082,23 @@ class ASSETSBRIDGE_OT_RetargetSkeleton(Operator):
         
         # Move source armature to target's collections
         if target_collections:
-            # Get source's current collections
-            source_collections = list(source_armature.users_collection)
+            # Diff against source's current collections instead of searching
+            # each collection's objects by name
+            target_set = set(target_collections)
+            source_set = set(source_armature.users_collection)
             
             # Add to target's collections
-            for coll in target_collections:
-                if source_armature.name not in coll.objects:
-                    coll.objects.link(source_armature)
+            for coll in target_set - source_set:
+                coll.objects.link(source_armature)
             
             # Remove from old collections (except if it's also a target collection)
-            for coll in source_collections:
-                if coll not in target_collections:
-                    coll.objects.unlink(source_armature)
+            for coll in source_set - target_set:
+                coll.objects.unlink(source_armature)
         
         # =========================================================================
         # Step 2: Parent meshes to source armature
         # =========================================================================
+        source_inverse = source_armature.matrix_world.inverted()
         for mesh_obj in meshes:
             if mesh_obj is None:
                 continue
@@ -685,7 +1113,7 @@ class ASSETSBRIDGE_OT_RetargetSkeleton(Operator):
                 mesh_obj.parent_type = 'OBJECT'
                 
                 # Restore world transform via parent inverse
-                mesh_obj.matrix_parent_inverse = source_armature.matrix_world.inverted() @ world_matrix
+                mesh_obj.matrix_parent_inverse = source_inverse @ world_matrix
             
             # Ensure armature modifier exists and points to correct armature
             has_armature_mod = False
@@ -705,9 +1133,10 @@ class ASSETSBRIDGE_OT_RetargetSkeleton(Operator):
             bpy.ops.object.mode_set(mode='OBJECT')
         
         deleted = 0
+        transferred = set(transferred_meshes)
         for mesh_obj in ue5_meshes:
             # Don't delete if it was a transferred mesh
-            if mesh_obj in transferred_meshes:
+            if mesh_obj in transferred:
                 continue
             
             # Check if object still exists
@@ -729,9 +1158,6 @@ class ASSETSBRIDGE_OT_RetargetSkeleton(Operator):
         if target is None or target.name not in bpy.data.objects:
             return False
         
-        # Deselect all first
-        bpy.ops.object.select_all(action='DESELECT')
-        
         # Delete the armature
         bpy.data.objects.remove(target, do_unlink=True)
         return True
@@ -744,8 +1170,10 @@ class ASSETSBRIDGE_OT_RetargetSkeleton(Operator):
         if context.mode != 'OBJECT':
             bpy.ops.object.mode_set(mode='OBJECT')
         
-        # Select and make source active
-        bpy.ops.object.select_all(action='DESELECT')
+        # Select and make source active; only the selected objects need
+        # deselecting, which avoids a select_all pass over the whole scene
+        for obj in context.selected_objects:
+            obj.select_set(False)
         source.select_set(True)
         context.view_layer.objects.active = source
         
@@ -755,104 +1183,193 @@ class ASSETSBRIDGE_OT_RetargetSkeleton(Operator):
         source_edit_bones = source.data.edit_bones
         target_bones = target.data.bones
         
-        # Get world matrices for coordinate transform
-        source_matrix_inv = source.matrix_world.inverted()
-        target_matrix = target.matrix_world
+        # Read every target head/tail in one call each
+        heads = np.empty(len(target_bones) * 3, dtype=np.float32)
+        tails = np.empty(len(target_bones) * 3, dtype=np.float32)
+        target_bones.foreach_get("head_local", heads)
+        target_bones.foreach_get("tail_local", tails)
+        
+        # Target armature space -> world -> source armature space, as one batched transform
+        to_source = np.array(source.matrix_world.inverted() @ target.matrix_world)
+        heads = heads.reshape(-1, 3)
+        tails = tails.reshape(-1, 3)
+        # Armatures sharing a world transform (the usual case) need no transform
+        if not np.allclose(to_source, np.eye(4), rtol=0.0, atol=1e-6):
+            rotation = to_source[:3, :3].T
+            translation = to_source[:3, 3]
+            heads = heads @ rotation + translation
+            tails = tails @ rotation + translation
+        
+        # Rolls for every target bone in one pass
+        matrices = np.empty(len(target_bones) * 16, dtype=np.float32)
+        target_bones.foreach_get("matrix_local", matrices)
+        rolls = matrix_euler_z(matrices.reshape(-1, 4, 4))
+        
+        # Name lookups on bpy collections are linear; hash them once instead
+        edit_bones_by_name = {b.name: b for b in source_edit_bones}
+        target_rows = {b.name: row for row, b in enumerate(target_bones)}
         
         for ue5_bone_name, target_bone_name in bone_map.items():
-            if ue5_bone_name not in source_edit_bones:
+            source_ebone = edit_bones_by_name.get(ue5_bone_name)
+            if source_ebone is None:
                 continue
-            if target_bone_name not in target_bones:
+            row = target_rows.get(target_bone_name)
+            if row is None:
                 continue
             
-            source_ebone = source_edit_bones[ue5_bone_name]
-            target_bone = target_bones[target_bone_name]
-            
-            # Get target bone head/tail in world space, then convert to source local space
-            target_head_world = target_matrix @ target_bone.head_local
-            target_tail_world = target_matrix @ target_bone.tail_local
-            
-            source_head_local = source_matrix_inv @ target_head_world
-            source_tail_local = source_matrix_inv @ target_tail_world
-            
             # Apply positions
-            source_ebone.head = source_head_local
-            source_ebone.tail = source_tail_local
+            source_ebone.head = Vector(heads[row])
+            source_ebone.tail = Vector(tails[row])
             
             # Copy bone roll from target
-            source_ebone.roll = target_bone.matrix_local.to_euler()[2]
+            source_ebone.roll = float(rolls[row])
             
             aligned += 1
         
+        # Bake the object scale straight into the edit bones while still in
+        # edit mode, rather than paying for transform_apply afterwards
+        scale = tuple(source.scale)
+        children = ()
+        bake_scale = False
+        if self.apply_scale and scale != (1.0, 1.0, 1.0):
+            # Object.children walks every object in the file; read it once
+            children = source.children
+            bake_scale = self.can_bake_scale(source, children)
+        if bake_scale:
+            self.bake_edit_bone_scale(source_edit_bones, scale)
+        
         # Back to object mode
         bpy.ops.object.mode_set(mode='OBJECT')
         
-        # Apply scale if requested
-        if self.apply_scale:
-            bpy.ops.object.select_all(action='DESELECT')
-            source.select_set(True)
-            context.view_layer.objects.active = source
-            bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+        if bake_scale:
+            # Children keep their world transform once the parent's scale is gone
+            scale_matrix = Matrix.Diagonal((*scale, 1.0))
+            for child in children:
+                child.matrix_parent_inverse = scale_matrix @ child.matrix_parent_inverse
+            source.scale = (1.0, 1.0, 1.0)
+        elif self.apply_scale and scale != (1.0, 1.0, 1.0):
+            # Non-uniform scale changes bone rolls; leave that to Blender
+            with context.temp_override(active_object=source, object=source,
+                                       selected_editable_objects=[source]):
+                bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
         
         return aligned
+    
+    @staticmethod
+    def can_bake_scale(obj, children):
+        """Whether obj's scale can be applied by scaling bone positions alone:
+        a positive uniform scale and only object-parented children."""
+        sx, sy, sz = obj.scale
+        if sx <= 0.0 or abs(sx - sy) > 1e-6 or abs(sx - sz) > 1e-6:
+            return False
+        return all(child.parent_type == 'OBJECT' for child in children)
+    
+    @staticmethod
+    def bake_edit_bone_scale(edit_bones, scale):
+        """Scale every edit bone's head/tail by the object scale, along with
+        the radius/envelope properties transform_apply would scale."""
+        factor = np.array(scale, dtype=np.float32)
+        coords = np.empty(len(edit_bones) * 3, dtype=np.float32)
+        for attr in ("head", "tail"):
+            edit_bones.foreach_get(attr, coords)
+            edit_bones.foreach_set(attr, (coords.reshape(-1, 3) * factor).ravel())
+        
+        # Same average scale factor Blender uses for these properties
+        prop_scale = float(np.sqrt(np.mean(factor.astype(np.float64) ** 2)))
+        values = np.empty(len(edit_bones), dtype=np.float32)
+        for attr in ("head_radius", "tail_radius", "envelope_distance", "bbone_x", "bbone_z"):
+            edit_bones.foreach_get(attr, values)
+            edit_bones.foreach_set(attr, values * prop_scale)
 
     def transfer_mesh_weights(self, context, source, target, bone_map):
         """Transfer vertex weights from meshes bound to target to source skeleton.
         Returns list of successfully transferred mesh objects."""
-        transferred_meshes = []
-        
-        # Find all meshes parented to or using the target armature
-        meshes_to_transfer = []
-        
-        for obj in bpy.data.objects:
-            if obj.type != 'MESH':
-                continue
-            
-            # Check if mesh has armature modifier pointing to target
-            for mod in obj.modifiers:
-                if mod.type == 'ARMATURE' and mod.object == target:
-                    meshes_to_transfer.append(obj)
-                    break
-            
-            # Also check parent
-            if obj.parent == target and obj not in meshes_to_transfer:
-                meshes_to_transfer.append(obj)
-        
-        for mesh_obj in meshes_to_transfer:
-            success = self.transfer_single_mesh_weights(context, mesh_obj, source, target, bone_map)
-            if success:
-                transferred_meshes.append(mesh_obj)
-        
-        return transferred_meshes
-
-    def transfer_single_mesh_weights(self, context, mesh_obj, source, target, bone_map):
-        """Transfer weights for a single mesh object."""
-        
         # Ensure object mode
         if context.mode != 'OBJECT':
             bpy.ops.object.mode_set(mode='OBJECT')
         
-        # Create reverse mapping (target bone -> ue5 bone)
+        # Find all meshes parented to or using the target armature
+        meshes_to_transfer = self.find_meshes_for_armature(target)
+        
+        # Create reverse mapping (target bone -> ue5 bone) once for all meshes
         reverse_map = {v: k for k, v in bone_map.items()}
         
-        # Rename vertex groups from target names to UE5 names
-        renamed_groups = 0
-        groups_to_rename = []
+        # Objects sharing a Mesh also share its vertex groups, so each round
+        # takes at most one user per Mesh. Later users are planned in a later
+        # round, against the groups the earlier ones left behind.
+        remaining = list(enumerate(meshes_to_transfer))
+        succeeded = set()
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            while remaining:
+                batch, deferred, seen_data = [], [], set()
+                for position, mesh_obj in remaining:
+                    data_key = mesh_obj.data.as_pointer()
+                    if data_key in seen_data:
+                        deferred.append((position, mesh_obj))
+                    else:
+                        seen_data.add(data_key)
+                        batch.append((position, mesh_obj))
+                remaining = deferred
+                
+                # Plan each mesh's renames and snapshot the weights its merges
+                # read. This touches bpy data, so it stays on the main thread.
+                plans = []
+                futures = []
+                for _, mesh_obj in batch:
+                    plan = self.plan_vertex_group_renames(mesh_obj, reverse_map)
+                    merges = [(vg.index, merge_into.index) for vg, _, merge_into in plan
+                              if merge_into is not None]
+                    plans.append(plan)
+                    # The merge math only reads the snapshot, so meshes run in parallel
+                    futures.append(executor.submit(
+                        _compute_merge_writes, _build_group_soa(mesh_obj), merges,
+                        len(mesh_obj.data.vertices)
+                    ) if merges else None)
+                
+                for (position, mesh_obj), plan, future in zip(batch, plans, futures):
+                    writes = future.result() if future else []
+                    if self.transfer_single_mesh_weights(mesh_obj, source, target, plan, writes):
+                        succeeded.add(position)
         
-        for vg in mesh_obj.vertex_groups:
-            if vg.name in reverse_map:
-                groups_to_rename.append((vg, reverse_map[vg.name]))
+        transferred_meshes = [mesh_obj for position, mesh_obj in enumerate(meshes_to_transfer)
+                              if position in succeeded]
+        return transferred_meshes
+
+    def plan_vertex_group_renames(self, mesh_obj, reverse_map):
+        """Work out how a mesh's vertex groups move from target to UE5 names.
+        Returns (vertex_group, new_name, merge_into) tuples in application
+        order; merge_into is the group to merge into when new_name is taken."""
+        plan = []
+        groups_by_name = {vg.name: vg for vg in mesh_obj.vertex_groups}
+        groups_to_rename = [(vg, reverse_map[vg.name]) for vg in mesh_obj.vertex_groups
+                            if vg.name in reverse_map]
         
         for vg, new_name in groups_to_rename:
             # Check if target name already exists
-            existing = mesh_obj.vertex_groups.get(new_name)
+            existing = groups_by_name.get(new_name)
+            del groups_by_name[vg.name]
             if existing and existing != vg:
-                # Merge weights
-                self.merge_vertex_groups(mesh_obj, vg, existing)
+                plan.append((vg, new_name, existing))
+            else:
+                groups_by_name[new_name] = vg
+                plan.append((vg, new_name, None))
+        
+        return plan
+
+    def transfer_single_mesh_weights(self, mesh_obj, source, target, plan, writes):
+        """Transfer weights for a single mesh object.
+        plan comes from plan_vertex_group_renames() and writes holds the
+        _compute_merge_writes() result for its merges, in the same order."""
+        
+        # Rename vertex groups from target names to UE5 names
+        writes = iter(writes)
+        for vg, new_name, merge_into in plan:
+            if merge_into is not None:
+                for weight, indices in next(writes):
+                    merge_into.add(indices, weight, 'REPLACE')
                 mesh_obj.vertex_groups.remove(vg)
             else:
                 vg.name = new_name
-            renamed_groups += 1
         
         # Update armature modifier to point to source (UE5) skeleton
         for mod in mesh_obj.modifiers:
@@ -865,25 +1382,7 @@ class ASSETSBRIDGE_OT_RetargetSkeleton(Operator):
             # Preserve transform
             mesh_obj.matrix_parent_inverse = source.matrix_world.inverted()
         
-        return renamed_groups > 0
-
-    def merge_vertex_groups(self, mesh_obj, source_vg, target_vg):
-        """Merge weights from source vertex group into target vertex group."""
-        mesh = mesh_obj.data
-        
-        for vert in mesh.vertices:
-            try:
-                source_weight = source_vg.weight(vert.index)
-                try:
-                    target_weight = target_vg.weight(vert.index)
-                    # Average the weights
-                    target_vg.add([vert.index], (source_weight + target_weight) / 2, 'REPLACE')
-                except RuntimeError:
-                    # Target doesn't have this vert, just add it
-                    target_vg.add([vert.index], source_weight, 'REPLACE')
-            except RuntimeError:
-                # Source doesn't have this vert, skip
-                pass
+        return len(plan) > 0
 
     def invoke(self, context, event):
         return context.window_manager.invoke_props_dialog(self, width=400)
@@ -964,6 +1463,7 @@ class ASSETSBRIDGE_OT_SetMappingTarget(Operator):
         mapping.confidence = 1.0
         mapping.category = 'HIGH'
         mapping.reason = 'manual_override'
+        update_mapping_counts(settings)
         
         self.report({'INFO'}, f"Set {mapping.ue5_bone} -> {bone_name}")
         return {'FINISHED'}
@@ -992,22 +1492,20 @@ class ASSETSBRIDGE_OT_ToggleAllMappings(Operator):
 # UI LIST
 # =============================================================================
 
+# Icon shown for each confidence category in the mapping list
+CATEGORY_ICONS = {
+    Confidence.HIGH: 'CHECKMARK',
+    Confidence.MEDIUM: 'QUESTION',
+    Confidence.LOW: 'ERROR',
+    Confidence.NONE: 'CANCEL',
+}
+
+
 class ASSETSBRIDGE_UL_BoneMappingList(bpy.types.UIList):
     """UI List for displaying bone mappings with color-coded confidence."""
     
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
-        settings = context.scene.ab_skeleton_retarget
-        
-        # Filter by category visibility
-        if item.category == 'HIGH' and not settings.show_high_confidence:
-            return
-        if item.category == 'MEDIUM' and not settings.show_medium_confidence:
-            return
-        if item.category == 'LOW' and not settings.show_low_confidence:
-            return
-        if item.category == 'NONE' and not settings.show_unmapped:
-            return
-        
+        # Hidden categories are already filtered out by filter_items
         if self.layout_type in {'DEFAULT', 'COMPACT'}:
             row = layout.row(align=True)
             
@@ -1015,16 +1513,7 @@ class ASSETSBRIDGE_UL_BoneMappingList(bpy.types.UIList):
             row.prop(item, "enabled", text="")
             
             # Color-coded icon based on confidence
-            if item.category == 'HIGH':
-                icon = 'CHECKMARK'
-            elif item.category == 'MEDIUM':
-                icon = 'QUESTION'
-            elif item.category == 'LOW':
-                icon = 'ERROR'
-            else:
-                icon = 'CANCEL'
-            
-            row.label(text="", icon=icon)
+            row.label(text="", icon=CATEGORY_ICONS.get(get_mapping_category_code(item), 'CANCEL'))
             
             # Bone names
             split = row.split(factor=0.45)
@@ -1047,29 +1536,23 @@ class ASSETSBRIDGE_UL_BoneMappingList(bpy.types.UIList):
         settings = context.scene.ab_skeleton_retarget
         items = getattr(data, propname)
         
-        # Filter
-        flt_flags = []
-        for item in items:
-            show = True
-            if item.category == 'HIGH' and not settings.show_high_confidence:
-                show = False
-            elif item.category == 'MEDIUM' and not settings.show_medium_confidence:
-                show = False
-            elif item.category == 'LOW' and not settings.show_low_confidence:
-                show = False
-            elif item.category == 'NONE' and not settings.show_unmapped:
-                show = False
-            
-            flt_flags.append(self.bitflag_filter_item if show else 0)
-        
-        # Sort by category then confidence
-        flt_neworder = []
-        category_order = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2, 'NONE': 3}
-        sorted_items = sorted(
-            enumerate(items),
-            key=lambda x: (category_order.get(x[1].category, 4), -x[1].confidence)
+        # Filter, reading the visibility toggles (indexed by category code) once
+        # per call rather than per item
+        show = (
+            settings.show_high_confidence,
+            settings.show_medium_confidence,
+            settings.show_low_confidence,
+            settings.show_unmapped,
         )
-        flt_neworder = [i for i, _ in sorted_items]
+        visible = self.bitflag_filter_item
+        codes = [get_mapping_category_code(item) for item in items]
+        flt_flags = [visible if show[code] else 0 for code in codes]
+        
+        # Sort by category (codes are ranked best first) then confidence,
+        # on precomputed keys
+        keyed = [(code, -item.confidence, i) for i, (code, item) in enumerate(zip(codes, items))]
+        keyed.sort()
+        flt_neworder = [i for _, _, i in keyed]
         
         return flt_flags, flt_neworder
 
@@ -1095,7 +1578,16 @@ class ASSETSBRIDGE_PT_SkeletonRetargetPanel(bpy.types.Panel):
         box = layout.box()
         box.label(text="1. Select Skeletons", icon='ARMATURE_DATA')
         
-        armatures = [obj for obj in context.selected_objects if obj.type == 'ARMATURE']
+        # Stop scanning the selection as soon as it can no longer hold exactly
+        # two armatures
+        selected = context.selected_objects
+        armatures = []
+        if len(selected) >= 2:
+            for obj in selected:
+                if obj.type == 'ARMATURE':
+                    armatures.append(obj)
+                    if len(armatures) > 2:
+                        break
         if len(armatures) == 2:
             target = context.active_object if context.active_object in armatures else None
             source = [a for a in armatures if a != target][0] if target else None
@@ -1111,6 +1603,7 @@ class ASSETSBRIDGE_PT_SkeletonRetargetPanel(bpy.types.Panel):
         row = box.row()
         row.operator("assetsbridge.build_bone_mapping", text="Build Mapping", icon='FILE_REFRESH')
         row.operator("assetsbridge.clear_bone_mapping", text="Clear", icon='X')
+        box.prop(settings, "verbose_logging")
         
         # Mapping list
         if settings.bone_mappings:
@@ -1125,13 +1618,9 @@ class ASSETSBRIDGE_PT_SkeletonRetargetPanel(bpy.types.Panel):
             row.prop(settings, "show_unmapped", text="", icon='CANCEL', toggle=True)
             
             # Statistics
-            high = sum(1 for m in settings.bone_mappings if m.category == 'HIGH')
-            medium = sum(1 for m in settings.bone_mappings if m.category == 'MEDIUM')
-            low = sum(1 for m in settings.bone_mappings if m.category == 'LOW')
-            unmapped = sum(1 for m in settings.bone_mappings if m.category == 'NONE')
-            
             row = box.row()
-            row.label(text=f"H:{high} M:{medium} L:{low} U:{unmapped}")
+            row.label(text=f"H:{settings.count_high} M:{settings.count_medium} "
+                           f"L:{settings.count_low} U:{settings.count_unmapped}")
             
             # UIList
             row = box.row()
@@ -1193,9 +1682,17 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.ab_skeleton_retarget = PointerProperty(type=SkeletonRetargetSettings)
+    bpy.app.handlers.load_post.append(migrate_mapping_categories)
+    # bpy.data is restricted while registering
+    bpy.app.timers.register(migrate_open_file_mapping_categories, first_interval=0.0)
+    warm_up_levenshtein()
 
 
 def unregister():
+    if migrate_mapping_categories in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(migrate_mapping_categories)
+    if bpy.app.timers.is_registered(migrate_open_file_mapping_categories):
+        bpy.app.timers.unregister(migrate_open_file_mapping_categories)
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.ab_skeleton_retarget
@@ -19,6 +19,8 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import re
+from functools import lru_cache
 from bpy.props import (
     StringProperty,
     BoolProperty,
@@ -33,33 +35,49 @@ from bpy.types import PropertyGroup, Operator
 # UTILITY FUNCTIONS
 # =============================================================================
 
+# Side naming conventions in one pattern. Alternation order keeps the
+# precedence: left suffix, left prefix, right suffix, right prefix.
+_SIDE_RE = re.compile(
+    r'(?P<LEFT>.*[._-](?:l|left)|(?:l[._-]|left).*)'
+    r'|(?P<RIGHT>.*[._-](?:r|right)|(?:r[._-]|right).*)',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Lowercase suffix/prefix -> mirrored replacement, looked up by the lengths
+# in _MIRROR_LENGTHS (shortest first, as the long forms end/start differently)
+_MIRROR_SUFFIXES = {
+    '_l': '_r', '_r': '_l',
+    '.l': '.r', '.r': '.l',
+    '-l': '-r', '-r': '-l',
+    '_left': '_right', '_right': '_left',
+    '.left': '.right', '.right': '.left',
+    '-left': '-right', '-right': '-left',
+}
+_MIRROR_PREFIXES = {
+    'l_': 'r_', 'r_': 'l_',
+    'l.': 'r.', 'r.': 'l.',
+    'l-': 'r-', 'r-': 'l-',
+    'left_': 'right_', 'right_': 'left_',
+    'left.': 'right.', 'right.': 'left.',
+    'left-': 'right-', 'right-': 'left-',
+}
+_MIRROR_LENGTHS = (2, 5, 6)
+
+# Substrings of (lowercase) helper bone names hidden unless show_all_bones is set
+HELPER_BONE_PATTERNS = ('twist', 'roll', 'helper', 'ik_', 'fk_', 'ctrl', 'mch', 'def_', 'org_')
+_HELPER_RE = re.compile('|'.join(map(re.escape, HELPER_BONE_PATTERNS)))
+
+
+def is_helper_bone(bone_name):
+    """Whether a bone is a twist/roll/control style helper bone."""
+    return _HELPER_RE.search(bone_name.lower()) is not None
+
+
+@lru_cache(maxsize=4096)
 def get_side_from_bone_name(name):
     """Determine if bone is left, right, or center based on naming conventions."""
-    name_lower = name.lower()
-    
-    # Common left patterns
-    left_patterns = ['_l', '.l', '-l', '_left', '.left', '-left']
-    # Check suffix patterns
-    for pattern in left_patterns:
-        if name_lower.endswith(pattern):
-            return 'LEFT'
-    # Check prefix patterns
-    if name_lower.startswith('l_') or name_lower.startswith('l.') or name_lower.startswith('l-'):
-        return 'LEFT'
-    if name_lower.startswith('left'):
-        return 'LEFT'
-    
-    # Common right patterns
-    right_patterns = ['_r', '.r', '-r', '_right', '.right', '-right']
-    for pattern in right_patterns:
-        if name_lower.endswith(pattern):
-            return 'RIGHT'
-    if name_lower.startswith('r_') or name_lower.startswith('r.') or name_lower.startswith('r-'):
-        return 'RIGHT'
-    if name_lower.startswith('right'):
-        return 'RIGHT'
-    
-    return 'CENTER'
+    match = _SIDE_RE.fullmatch(name)
+    return match.lastgroup if match else 'CENTER'
 
 
 def get_armature_from_mesh(mesh_obj):
@@ -99,39 +117,92 @@ def get_mesh_from_context(context):
     return None
 
 
+@lru_cache(maxsize=4096)
 def get_mirror_bone_name(bone_name):
     """Get the mirrored bone name (left <-> right)."""
     name_lower = bone_name.lower()
     
-    # Suffix patterns
-    replacements = [
-        ('_l', '_r'), ('_r', '_l'),
-        ('.l', '.r'), ('.r', '.l'),
-        ('-l', '-r'), ('-r', '-l'),
-        ('_left', '_right'), ('_right', '_left'),
-        ('.left', '.right'), ('.right', '.left'),
-        ('-left', '-right'), ('-right', '-left'),
-    ]
+    for length in _MIRROR_LENGTHS:
+        new = _MIRROR_SUFFIXES.get(name_lower[-length:])
+        if new:
+            return bone_name[:-length] + (new.upper() if bone_name[-1].isupper() else new)
     
-    for old, new in replacements:
-        if name_lower.endswith(old):
-            return bone_name[:-len(old)] + (new.upper() if bone_name[-1].isupper() else new)
+    for length in _MIRROR_LENGTHS:
+        new = _MIRROR_PREFIXES.get(name_lower[:length])
+        if new:
+            return (new.upper() if bone_name[0].isupper() else new) + bone_name[length:]
     
-    # Prefix patterns
-    prefix_replacements = [
-        ('l_', 'r_'), ('r_', 'l_'),
-        ('l.', 'r.'), ('r.', 'l.'),
-        ('l-', 'r-'), ('r-', 'l-'),
-        ('left_', 'right_'), ('right_', 'left_'),
-        ('left.', 'right.'), ('right.', 'left.'),
-        ('left-', 'right-'), ('right-', 'left-'),
-    ]
+    return None
+
+
+def weight_tools_need_object_mode(context, mesh_obj):
+    """Whether the weight tools must drop to object mode to act on the whole
+    mesh. Weight paint mode works as is unless a selection mask is enabled."""
+    if context.mode == 'OBJECT':
+        return False
+    if context.mode == 'PAINT_WEIGHT':
+        return mesh_obj.data.use_paint_mask or mesh_obj.data.use_paint_mask_vertex
+    return True
+
+
+def weight_tool_override(context, mesh_obj):
+    """Context override that runs vertex group operators on mesh_obj alone,
+    without changing the scene's selection or active object."""
+    return context.temp_override(
+        active_object=mesh_obj,
+        object=mesh_obj,
+        selected_objects=[mesh_obj],
+        selected_editable_objects=[mesh_obj]
+    )
+
+
+# Vertex group name -> index per mesh object, keyed by Object.as_pointer()
+_vg_index_cache = {}
+
+
+def ensure_vertex_group_index(mesh_obj, name):
+    """Get the index of mesh_obj's vertex group called name, creating the group
+    if it is missing. Indices are cached per mesh and rebuilt when the group
+    count changes or a cached entry no longer names the same group."""
+    vertex_groups = mesh_obj.vertex_groups
+    key = mesh_obj.as_pointer()
+    indices = _vg_index_cache.get(key)
+    if indices is None or len(indices) != len(vertex_groups):
+        indices = {vg.name: vg.index for vg in vertex_groups}
+        _vg_index_cache[key] = indices
     
-    for old, new in prefix_replacements:
-        if name_lower.startswith(old):
-            return (new.upper() if bone_name[0].isupper() else new) + bone_name[len(old):]
+    index = indices.get(name)
+    if index is None or vertex_groups[index].name != name:
+        # Groups were renamed or reordered since the cache was built
+        indices.clear()
+        indices.update((vg.name, vg.index) for vg in vertex_groups)
+        index = indices.get(name)
+        if index is None:
+            index = vertex_groups.new(name=name).index
+            indices[name] = index
     
-    return None
+    return index
+
+
+def prune_vertex_group_index_cache():
+    """Drop cached indices of meshes that no longer exist, so the cache stays
+    bounded and a freed pointer cannot pick up a deleted mesh's entry."""
+    live = {obj.as_pointer() for obj in bpy.data.objects if obj.type == 'MESH'}
+    for key in _vg_index_cache.keys() - live:
+        del _vg_index_cache[key]
+
+
+# Rig prefixes dropped from bone button labels (DEF_, def-, ORG_, ...)
+_SHORT_NAME_PREFIX_RE = re.compile(r'^(?:DEF|def|ORG|org)[_-]')
+
+
+def get_short_bone_name(bone_name):
+    """Get a shortened version of the bone name for button display."""
+    # Remove common prefixes
+    name = _SHORT_NAME_PREFIX_RE.sub('', bone_name, count=1)
+    
+    # Truncate if too long
+    return name if len(name) <= 12 else name[:10] + ".."
 
 
 def categorize_bones(armature):
@@ -160,6 +231,42 @@ def categorize_bones(armature):
     return left_bones, center_bones, right_bones
 
 
+def filter_bone_columns(settings, filter_text):
+    """Filter the refreshed bone list down to the bones the panel shows, as
+    sorted (left, center, right) tuples of (name, short_name)."""
+    filter_text = filter_text.lower()
+    show_all_bones = settings.show_all_bones
+    
+    def should_show_bone(item):
+        """Check if bone should be shown based on filter settings."""
+        # Hide helper bones unless show_all is enabled
+        if not show_all_bones and item.is_helper:
+            return False
+        
+        # Apply text filter
+        if filter_text and filter_text not in item.name.lower():
+            return False
+        
+        return True
+    
+    # The list is already sorted within each side on refresh; partition it
+    # into columns in a single pass
+    columns = {'LEFT': [], 'CENTER': [], 'RIGHT': []}
+    for item in settings.bones:
+        if should_show_bone(item):
+            columns[item.side].append((item.name, item.short_name))
+    return tuple(columns['LEFT']), tuple(columns['CENTER']), tuple(columns['RIGHT'])
+
+
+# Filtered bone columns per (armature, list size, filter, show all)
+_bone_column_cache = {}
+
+
+def invalidate_bone_columns(self=None, context=None):
+    """Drop cached bone columns; also used as a property update callback."""
+    _bone_column_cache.clear()
+
+
 # =============================================================================
 # PROPERTY GROUPS
 # =============================================================================
@@ -167,6 +274,12 @@ def categorize_bones(armature):
 class SkinningBoneItem(PropertyGroup):
     """Single bone entry for the skinning panel."""
     name: StringProperty(name="Bone Name", default="")
+    short_name: StringProperty(name="Short Name", description="Button label for the bone", default="")
+    is_helper: BoolProperty(
+        name="Is Helper",
+        description="Twist, roll, control or other helper bone hidden unless showing all bones",
+        default=False
+    )
     side: EnumProperty(
         name="Side",
         items=[
@@ -189,17 +302,22 @@ class SkinningSettings(PropertyGroup):
     show_all_bones: BoolProperty(
         name="Show All Bones",
         description="Show all bones including twist, roll, and helper bones",
-        default=False
+        default=False,
+        update=invalidate_bone_columns
     )
     filter_text: StringProperty(
         name="Filter",
         description="Filter bones by name",
+        default="",
+        update=invalidate_bone_columns
+    )
+    # Cache for categorized bones, sorted within each side
+    bones_armature: StringProperty(
+        name="Bones Armature",
+        description="Armature the cached bone list was built from",
         default=""
     )
-    # Cache for categorized bones
-    left_bones: CollectionProperty(type=SkinningBoneItem)
-    center_bones: CollectionProperty(type=SkinningBoneItem)
-    right_bones: CollectionProperty(type=SkinningBoneItem)
+    bones: CollectionProperty(type=SkinningBoneItem)
 
 
 # =============================================================================
@@ -258,22 +376,22 @@ class ASSETSBRIDGE_OT_SelectBoneForPaint(Operator):
             # Enter weight paint mode
             bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
         
-        # Now select the bone in the armature
+        # Now select the bone in the armature. Look it up after the mode
+        # switch: leaving edit mode rebuilds the armature's bones.
         # We need to set the armature to pose mode bone selection
-        armature.data.bones.active = armature.data.bones[self.bone_name]
+        bones = armature.data.bones
+        index = bones.find(self.bone_name)
+        bones.active = bones[index]
         
-        # Also set pose bone as active if in pose mode context
+        # Also set pose bone as active if in pose mode context; select only
+        # this bone with one write over the whole collection
         if armature.pose:
-            for pb in armature.pose.bones:
-                pb.bone.select = (pb.name == self.bone_name)
+            selected = [False] * len(bones)
+            selected[index] = True
+            bones.foreach_set("select", selected)
         
-        # Ensure the vertex group exists for this bone
-        if self.bone_name not in mesh_obj.vertex_groups:
-            mesh_obj.vertex_groups.new(name=self.bone_name)
-        
-        # Set active vertex group
-        vg_index = mesh_obj.vertex_groups[self.bone_name].index
-        mesh_obj.vertex_groups.active_index = vg_index
+        # Ensure the vertex group exists for this bone and make it active
+        mesh_obj.vertex_groups.active_index = ensure_vertex_group_index(mesh_obj, self.bone_name)
         
         self.report({'INFO'}, f"Selected bone: {self.bone_name}")
         return {'FINISHED'}
@@ -301,28 +419,23 @@ class ASSETSBRIDGE_OT_RefreshSkinningBones(Operator):
             self.report({'WARNING'}, "No armature found")
             return {'CANCELLED'}
         
-        # Clear existing bone lists
-        settings.left_bones.clear()
-        settings.center_bones.clear()
-        settings.right_bones.clear()
+        invalidate_bone_columns()
+        prune_vertex_group_index_cache()
         
-        # Categorize and populate
-        left, center, right = categorize_bones(armature)
+        # Clear existing bone list
+        settings.bones.clear()
         
-        for bone_name in left:
-            item = settings.left_bones.add()
-            item.name = bone_name
-            item.side = 'LEFT'
-        
-        for bone_name in center:
-            item = settings.center_bones.add()
-            item.name = bone_name
-            item.side = 'CENTER'
+        # Categorize and populate, one side after another
+        left, center, right = categorize_bones(armature)
+        settings.bones_armature = armature.name
         
-        for bone_name in right:
-            item = settings.right_bones.add()
-            item.name = bone_name
-            item.side = 'RIGHT'
+        for side, bone_names in (('LEFT', left), ('CENTER', center), ('RIGHT', right)):
+            for bone_name in bone_names:
+                item = settings.bones.add()
+                item.name = bone_name
+                item.short_name = get_short_bone_name(bone_name)
+                item.is_helper = is_helper_bone(bone_name)
+                item.side = side
         
         self.report({'INFO'}, f"Found {len(left)} left, {len(center)} center, {len(right)} right bones")
         return {'FINISHED'}
@@ -357,32 +470,28 @@ class ASSETSBRIDGE_OT_CopyWeightsAcross(Operator):
         
         # Store current mode
         original_mode = context.mode
-        
-        # Need to be in object mode for weight operations
-        if original_mode != 'OBJECT':
+        switch_mode = weight_tools_need_object_mode(context, mesh_obj)
+        if switch_mode:
             bpy.ops.object.mode_set(mode='OBJECT')
         
-        # Select only the mesh
-        bpy.ops.object.select_all(action='DESELECT')
-        mesh_obj.select_set(True)
-        context.view_layer.objects.active = mesh_obj
-        
         # Use Blender's built-in mirror weights operator
         try:
-            bpy.ops.object.vertex_group_mirror(
-                mirror_weights=True,
-                flip_group_names=True,
-                all_groups=True,
-                use_topology=False
-            )
+            with weight_tool_override(context, mesh_obj):
+                bpy.ops.object.vertex_group_mirror(
+                    mirror_weights=True,
+                    flip_group_names=True,
+                    all_groups=True,
+                    use_topology=False
+                )
             self.report({'INFO'}, "Weights mirrored successfully")
         except Exception as e:
             self.report({'ERROR'}, f"Failed to mirror weights: {str(e)}")
             return {'CANCELLED'}
         
-        # Restore mode if we were in weight paint
-        if original_mode == 'PAINT_WEIGHT':
-            bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
+        # Restore mode if we left weight paint
+        if switch_mode and original_mode == 'PAINT_WEIGHT':
+            with weight_tool_override(context, mesh_obj):
+                bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
         
         return {'FINISHED'}
 
@@ -418,27 +527,23 @@ class ASSETSBRIDGE_OT_NormalizeAllWeights(Operator):
         
         # Store current mode
         original_mode = context.mode
-        
-        # Need to be in object mode
-        if original_mode != 'OBJECT':
+        switch_mode = weight_tools_need_object_mode(context, mesh_obj)
+        if switch_mode:
             bpy.ops.object.mode_set(mode='OBJECT')
         
-        # Select mesh
-        bpy.ops.object.select_all(action='DESELECT')
-        mesh_obj.select_set(True)
-        context.view_layer.objects.active = mesh_obj
-        
         # Normalize all weights
         try:
-            bpy.ops.object.vertex_group_normalize_all(lock_active=False)
+            with weight_tool_override(context, mesh_obj):
+                bpy.ops.object.vertex_group_normalize_all(lock_active=False)
             self.report({'INFO'}, "All weights normalized")
         except Exception as e:
             self.report({'ERROR'}, f"Failed to normalize: {str(e)}")
             return {'CANCELLED'}
         
-        # Restore mode
-        if original_mode == 'PAINT_WEIGHT':
-            bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
+        # Restore mode if we left weight paint
+        if switch_mode and original_mode == 'PAINT_WEIGHT':
+            with weight_tool_override(context, mesh_obj):
+                bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
         
         return {'FINISHED'}
 
@@ -471,23 +576,22 @@ class ASSETSBRIDGE_OT_CleanupWeights(Operator):
         
         # Store current mode
         original_mode = context.mode
-        
-        if original_mode != 'OBJECT':
+        switch_mode = weight_tools_need_object_mode(context, mesh_obj)
+        if switch_mode:
             bpy.ops.object.mode_set(mode='OBJECT')
         
-        bpy.ops.object.select_all(action='DESELECT')
-        mesh_obj.select_set(True)
-        context.view_layer.objects.active = mesh_obj
-        
         try:
-            bpy.ops.object.vertex_group_clean(group_select_mode='ALL', limit=self.threshold)
+            with weight_tool_override(context, mesh_obj):
+                bpy.ops.object.vertex_group_clean(group_select_mode='ALL', limit=self.threshold)
             self.report({'INFO'}, f"Cleaned weights below {self.threshold}")
         except Exception as e:
             self.report({'ERROR'}, f"Failed to clean weights: {str(e)}")
             return {'CANCELLED'}
         
-        if original_mode == 'PAINT_WEIGHT':
-            bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
+        # Restore mode if we left weight paint
+        if switch_mode and original_mode == 'PAINT_WEIGHT':
+            with weight_tool_override(context, mesh_obj):
+                bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
         
         return {'FINISHED'}
 
@@ -564,48 +668,20 @@ class ASSETSBRIDGE_PT_SkinningPanel(bpy.types.Panel):
 
     def draw_bone_columns(self, context, layout, settings, armature):
         """Draw the three-column bone button layout."""
-        filter_text = settings.filter_text.lower()
-        
-        # Helper bones to hide unless show_all is enabled
-        helper_patterns = ['twist', 'roll', 'helper', 'ik_', 'fk_', 'ctrl', 'mch', 'def_', 'org_']
-        
-        def should_show_bone(bone_name):
-            """Check if bone should be shown based on filter settings."""
-            name_lower = bone_name.lower()
-            
-            # Apply text filter
-            if filter_text and filter_text not in name_lower:
-                return False
-            
-            # Hide helper bones unless show_all is enabled
-            if not settings.show_all_bones:
-                for pattern in helper_patterns:
-                    if pattern in name_lower:
-                        return False
-            
-            return True
-        
-        # Get bones directly from armature for real-time accuracy
-        left_bones = []
-        center_bones = []
-        right_bones = []
-        
-        for bone in armature.data.bones:
-            if not should_show_bone(bone.name):
-                continue
-            
-            side = get_side_from_bone_name(bone.name)
-            if side == 'LEFT':
-                left_bones.append(bone.name)
-            elif side == 'RIGHT':
-                right_bones.append(bone.name)
-            else:
-                center_bones.append(bone.name)
+        # Bones come from the list built by Refresh Bones, not the armature
+        if settings.bones_armature != armature.name:
+            layout.label(text="Click Refresh Bones to list this armature's bones", icon='INFO')
+            return
         
-        # Sort for consistent display
-        left_bones.sort()
-        center_bones.sort()
-        right_bones.sort()
+        # Panels redraw on every mouse move; only re-filter the bones when the
+        # list or the filter settings change
+        filter_text = settings.filter_text
+        key = (armature.name, len(settings.bones), filter_text, settings.show_all_bones)
+        columns = _bone_column_cache.get(key)
+        if columns is None:
+            columns = filter_bone_columns(settings, filter_text)
+            _bone_column_cache[key] = columns
+        left_bones, center_bones, right_bones = columns
         
         # Calculate max rows needed
         max_bones = max(len(left_bones), len(center_bones), len(right_bones))
@@ -620,6 +696,10 @@ class ASSETSBRIDGE_PT_SkinningPanel(bpy.types.Panel):
         header.label(text="Center", icon='TRIA_UP')
         header.label(text="Right", icon='TRIA_RIGHT')
         
+        # Resolve the active bone once instead of per button
+        active_bone = armature.data.bones.active
+        active_name = active_bone.name if active_bone else None
+        
         # Draw bone buttons
         # Use a scrollable region via box
         box = layout.box()
@@ -630,55 +710,35 @@ class ASSETSBRIDGE_PT_SkinningPanel(bpy.types.Panel):
             
             # Left bone button
             if i < len(left_bones):
-                bone_name = left_bones[i]
-                self.draw_bone_button(row, bone_name, armature)
+                bone_name, short_name = left_bones[i]
+                self.draw_bone_button(row, bone_name, short_name, active_name)
             else:
                 row.label(text="")
             
             # Center bone button
             if i < len(center_bones):
-                bone_name = center_bones[i]
-                self.draw_bone_button(row, bone_name, armature)
+                bone_name, short_name = center_bones[i]
+                self.draw_bone_button(row, bone_name, short_name, active_name)
             else:
                 row.label(text="")
             
             # Right bone button
             if i < len(right_bones):
-                bone_name = right_bones[i]
-                self.draw_bone_button(row, bone_name, armature)
+                bone_name, short_name = right_bones[i]
+                self.draw_bone_button(row, bone_name, short_name, active_name)
             else:
                 row.label(text="")
 
-    def draw_bone_button(self, row, bone_name, armature):
+    def draw_bone_button(self, row, bone_name, short_name, active_name):
         """Draw a single bone button with appropriate styling."""
-        # Check if this is the active bone
-        is_active = (armature.data.bones.active and 
-                     armature.data.bones.active.name == bone_name)
-        
-        # Create operator button
+        # Create operator button, pressed for the active bone
         op = row.operator(
             "assetsbridge.select_bone_for_paint",
-            text=self.get_short_bone_name(bone_name),
-            depress=is_active
+            text=short_name,
+            depress=(bone_name == active_name)
         )
         op.bone_name = bone_name
 
-    def get_short_bone_name(self, bone_name):
-        """Get a shortened version of the bone name for button display."""
-        # Remove common prefixes
-        prefixes = ['DEF_', 'DEF-', 'def_', 'def-', 'ORG_', 'ORG-', 'org_', 'org-']
-        name = bone_name
-        for prefix in prefixes:
-            if name.startswith(prefix):
-                name = name[len(prefix):]
-                break
-        
-        # Truncate if too long
-        if len(name) > 12:
-            name = name[:10] + ".."
-        
-        return name
-
 
 # =============================================================================
 # REGISTRATION
@@ -696,13 +756,15 @@ classes = [
 ]
 
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
+
 def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
+    _register_classes()
     bpy.types.Scene.ab_skinning = PointerProperty(type=SkinningSettings)
 
 
 def unregister():
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+    _vg_index_cache.clear()
+    _unregister_classes()
     del bpy.types.Scene.ab_skinning